@@ -1,11 +1,41 @@
 """Basic configuration helpers for the FastAPI backend."""
 from functools import lru_cache
+from pathlib import Path
+
 from pydantic_settings import BaseSettings
 
+BASE_DIR = Path(__file__).resolve().parents[1]
+
 
 class Settings(BaseSettings):
     app_name: str = "Dress Search API"
     frontend_origin: list = ["http://localhost:5173", "http://localhost:5174", "http://127.0.0.1:5173", "http://127.0.0.1:5174"]
+    # Inference backend for the CLIP towers: "torch" (sentence-transformers) or "onnx".
+    clip_backend: str = "torch"
+    # Directory holding the exported ONNX towers, relative to backend/ unless absolute.
+    onnx_dir: str = "models/onnx"
+    # Use the dynamically int8-quantized ONNX graphs instead of the float32 exports.
+    onnx_quantized: bool = True
+    # Which model artifacts this process loads: "all", "query" (text tower only) or "ingest".
+    model_role: str = "all"
+    # Zero-shot prompt templates; embeddings of all templates are averaged per label.
+    prompt_templates: list = ["a {label} dress"]
+    # Minimum stored probability for an image to satisfy a parsed query filter.
+    filter_threshold: float = 0.2
+    # Weight of the mean filter probability added to CLIP similarity when ranking.
+    filter_weight: float = 0.1
+    # SQLite database file; each shard instance points at its own file.
+    db_path: str = "dress_search.db"
+    # Shard base URLs; when set, /coordinator/search fans queries out to them.
+    shard_urls: list = []
+    # Seconds to wait for each shard before returning partial results.
+    shard_timeout: float = 5.0
+    # /search response cache: "memory" (per worker), "sqlite" (shared on disk) or "none".
+    response_cache_backend: str = "memory"
+    response_cache_max_bytes: int = 64 * 1024 * 1024
+    response_cache_path: str = "cache/response_cache.db"
+    # Directory for derived artifacts such as the taxonomy prompt table.
+    cache_dir: str = "cache"
 
     class Config:
         env_prefix = "DRESS_SEARCH_"
@@ -16,3 +46,9 @@ class Settings(BaseSettings):
 def get_settings() -> Settings:
     """Return a cached settings instance."""
     return Settings()
+
+
+def resolve_path(value: str) -> Path:
+    """Resolve a configured path relative to the backend directory."""
+    path = Path(value)
+    return path if path.is_absolute() else BASE_DIR / path
@@ -5,11 +5,16 @@ import json
 import sqlite3
 from dataclasses import dataclass
 from pathlib import Path
-from typing import Iterable, Mapping, Sequence
+from typing import Iterable, Sequence
+
+from .config import get_settings, resolve_path
 
 DB_FILENAME = "dress_search.db"
 BASE_DIR = Path(__file__).resolve().parents[1]
 DB_PATH = BASE_DIR / DB_FILENAME
+ATTRIBUTE_COLUMNS = ("silhouette", "length", "sleeve_type", "color")
+# Seconds a writer waits on a locked database, so batch jobs can run beside the API.
+BUSY_TIMEOUT = 30.0
 
 
 SCHEMA_STATEMENTS: Iterable[str] = (
@@ -32,24 +37,92 @@ SCHEMA_STATEMENTS: Iterable[str] = (
         FOREIGN KEY(image_id) REFERENCES images(id) ON DELETE CASCADE
     );
     """,
+    """
+    CREATE TABLE IF NOT EXISTS attribute_scores (
+        image_id INTEGER PRIMARY KEY,
+        layout TEXT NOT NULL,
+        scores BLOB NOT NULL,
+        FOREIGN KEY(image_id) REFERENCES images(id) ON DELETE CASCADE
+    );
+    """,
+    """
+    CREATE TABLE IF NOT EXISTS meta (
+        key TEXT PRIMARY KEY,
+        value INTEGER NOT NULL
+    );
+    """,
+    """
+    INSERT OR IGNORE INTO meta (key, value) VALUES ('index_generation', 0);
+    """,
+    # Random per-database id, so caches never confuse shards or a recreated database.
+    """
+    INSERT OR IGNORE INTO meta (key, value) VALUES ('catalog_id', abs(random()));
+    """,
+    """
+    CREATE TABLE IF NOT EXISTS job_progress (
+        name TEXT PRIMARY KEY,
+        signature TEXT NOT NULL,
+        last_image_id INTEGER NOT NULL
+    );
+    """,
 )
 
 
-def get_connection() -> sqlite3.Connection:
-    """Return a connection to the project database, creating directories as needed."""
-    DB_PATH.parent.mkdir(parents=True, exist_ok=True)
-    conn = sqlite3.connect(DB_PATH)
+def get_db_path() -> Path:
+    """Return the configured database path (``settings.db_path``, one file per shard)."""
+    return resolve_path(get_settings().db_path)
+
+
+def connect(path: Path) -> sqlite3.Connection:
+    """Return a connection to the database at ``path``, creating directories as needed."""
+    path.parent.mkdir(parents=True, exist_ok=True)
+    conn = sqlite3.connect(path, timeout=BUSY_TIMEOUT)
     conn.row_factory = sqlite3.Row
     return conn
 
 
+def get_connection() -> sqlite3.Connection:
+    """Return a connection to the project database, creating directories as needed."""
+    return connect(get_db_path())
+
+
+def apply_schema(conn: sqlite3.Connection) -> None:
+    """Create tables on an open connection if they do not exist."""
+    # WAL lets readers (the API) proceed while a background job holds the write lock.
+    conn.execute("PRAGMA journal_mode=WAL")
+    cursor = conn.cursor()
+    for statement in SCHEMA_STATEMENTS:
+        cursor.executescript(statement)
+    conn.commit()
+
+
 def initialize_schema() -> None:
     """Create tables if they do not exist."""
+    with get_connection() as conn:
+        apply_schema(conn)
+
+
+def get_index_generation() -> int:
+    """Return the catalog generation, bumped by every write that can change search results."""
     with get_connection() as conn:
         cursor = conn.cursor()
-        for statement in SCHEMA_STATEMENTS:
-            cursor.executescript(statement)
-        conn.commit()
+        cursor.execute("SELECT value FROM meta WHERE key = 'index_generation'")
+        row = cursor.fetchone()
+    return int(row["value"]) if row else 0
+
+
+def get_index_state() -> tuple[int, int]:
+    """Return ``(catalog_id, index_generation)`` for the configured database in one read."""
+    with get_connection() as conn:
+        cursor = conn.cursor()
+        cursor.execute("SELECT key, value FROM meta WHERE key IN ('catalog_id', 'index_generation')")
+        values = {row["key"]: int(row["value"]) for row in cursor.fetchall()}
+    return values.get("catalog_id", 0), values.get("index_generation", 0)
+
+
+def bump_index_generation(cursor: sqlite3.Cursor) -> None:
+    """Advance the catalog generation inside the caller's write transaction."""
+    cursor.execute("UPDATE meta SET value = value + 1 WHERE key = 'index_generation'")
 
 
 @dataclass(slots=True)
@@ -63,8 +136,13 @@ class ImageRecord:
     metadata_json: str
 
 
-def insert_image(record: ImageRecord, vector: bytes) -> None:
-    """Persist an image record and its embedding as an atomic operation."""
+def insert_image(
+    record: ImageRecord,
+    vector: bytes,
+    scores: bytes | None = None,
+    score_layout: str | None = None,
+) -> None:
+    """Persist an image record, its embedding and optional label probabilities atomically."""
     with get_connection() as conn:
         cursor = conn.cursor()
         cursor.execute(
@@ -89,6 +167,14 @@ def insert_image(record: ImageRecord, vector: bytes) -> None:
             """,
             (image_id, vector),
         )
+        if scores is not None:
+            cursor.execute(
+                """
+                INSERT OR REPLACE INTO attribute_scores (image_id, layout, scores) VALUES (?, ?, ?)
+                """,
+                (image_id, score_layout, scores),
+            )
+        bump_index_generation(cursor)
         conn.commit()
 
 
@@ -106,6 +192,23 @@ def fetch_all_embeddings() -> Sequence[sqlite3.Row]:
         return cursor.fetchall()
 
 
+def fetch_catalog() -> Sequence[sqlite3.Row]:
+    """Return every image with its embedding and stored label probabilities (if any)."""
+    with get_connection() as conn:
+        cursor = conn.cursor()
+        cursor.execute(
+            """
+            SELECT images.*, embeddings.vector,
+                   attribute_scores.layout AS score_layout, attribute_scores.scores
+            FROM images
+            JOIN embeddings ON images.id = embeddings.image_id
+            LEFT JOIN attribute_scores ON images.id = attribute_scores.image_id
+            ORDER BY images.id
+            """
+        )
+        return cursor.fetchall()
+
+
 def fetch_images() -> Sequence[sqlite3.Row]:
     """Return all image metadata without embeddings."""
     with get_connection() as conn:
@@ -119,26 +222,104 @@ def fetch_images() -> Sequence[sqlite3.Row]:
         return cursor.fetchall()
 
 
-def fetch_with_filters(filters: Mapping[str, str]) -> Sequence[sqlite3.Row]:
-    """Return images joined with embeddings filtered by provided columns."""
-    clauses = []
-    params: list[str] = []
-    for column in ("silhouette", "length", "sleeve_type", "color"):
-        value = filters.get(column)
-        if value:
-            clauses.append(f"images.{column} = ?")
-            params.append(value)
+def fetch_embedding_chunk(after_id: int, limit: int) -> Sequence[sqlite3.Row]:
+    """Return up to ``limit`` embeddings with ``image_id`` greater than ``after_id``."""
+    with get_connection() as conn:
+        cursor = conn.cursor()
+        cursor.execute(
+            """
+            SELECT image_id, vector FROM embeddings
+            WHERE image_id > ?
+            ORDER BY image_id
+            LIMIT ?
+            """,
+            (after_id, limit),
+        )
+        return cursor.fetchall()
+
+
+def get_job_checkpoint(name: str, signature: str) -> int:
+    """Return the last processed image id for a job, or 0 if it ran against another signature."""
+    with get_connection() as conn:
+        cursor = conn.cursor()
+        cursor.execute("SELECT signature, last_image_id FROM job_progress WHERE name = ?", (name,))
+        row = cursor.fetchone()
+    if row is None or row["signature"] != signature:
+        return 0
+    return int(row["last_image_id"])
+
 
-    where_clause = f"WHERE {' AND '.join(clauses)}" if clauses else ""
+def update_attributes(
+    updates: Sequence[tuple],
+    scores: Sequence[tuple],
+    job_name: str,
+    signature: str,
+    last_image_id: int,
+) -> None:
+    """Bulk-update attribute columns and scores, advancing the job checkpoint in one transaction.
 
-    query = f"""
-        SELECT images.*, embeddings.vector FROM images
-        JOIN embeddings ON images.id = embeddings.image_id
-        {where_clause}
-        ORDER BY images.id
+    Each update is ``(silhouette, length, sleeve_type, color, attributes_json, image_id)``
+    and each score row is ``(image_id, layout, scores)``.
     """
+    with get_connection() as conn:
+        cursor = conn.cursor()
+        cursor.executemany(
+            """
+            UPDATE images
+            SET silhouette = ?, length = ?, sleeve_type = ?, color = ?,
+                metadata_json = json_set(metadata_json, '$.attributes', json(?))
+            WHERE id = ?
+            """,
+            updates,
+        )
+        cursor.executemany(
+            """
+            INSERT OR REPLACE INTO attribute_scores (image_id, layout, scores) VALUES (?, ?, ?)
+            """,
+            scores,
+        )
+        cursor.execute(
+            """
+            INSERT OR REPLACE INTO job_progress (name, signature, last_image_id) VALUES (?, ?, ?)
+            """,
+            (job_name, signature, last_image_id),
+        )
+        bump_index_generation(cursor)
+        conn.commit()
+
+
+def load_catalog(
+    images: Iterable[tuple],
+    embeddings: Iterable[tuple],
+    scores: Iterable[tuple],
+    replace: bool = False,
+) -> None:
+    """Bulk-load a catalog in one transaction, optionally clearing existing rows first.
 
+    ``images`` rows follow the ``images`` column order (id first), ``embeddings`` rows are
+    ``(image_id, vector)`` and ``scores`` rows are ``(image_id, layout, scores)``.
+    """
     with get_connection() as conn:
         cursor = conn.cursor()
-        cursor.execute(query, params)
-        return cursor.fetchall()
+        if replace:
+            # Job checkpoints refer to the old catalog's ids.
+            for table in ("attribute_scores", "embeddings", "images", "job_progress"):
+                cursor.execute(f"DELETE FROM {table}")
+        else:
+            cursor.execute("SELECT COUNT(*) FROM images")
+            if cursor.fetchone()[0]:
+                raise ValueError("Database already contains images; pass replace=True to overwrite")
+        cursor.executemany(
+            """
+            INSERT INTO images (id, filename, file_path, silhouette, length, sleeve_type, color, metadata_json)
+            VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+            """,
+            images,
+        )
+        cursor.executemany("INSERT INTO embeddings (image_id, vector) VALUES (?, ?)", embeddings)
+        cursor.executemany(
+            "INSERT INTO attribute_scores (image_id, layout, scores) VALUES (?, ?, ?)",
+            scores,
+        )
+        bump_index_generation(cursor)
+        conn.commit()
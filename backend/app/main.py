@@ -2,16 +2,17 @@
 from __future__ import annotations
 
 import json
+import sqlite3
 from typing import Dict, List
 
 import numpy as np
-from fastapi import FastAPI
+from fastapi import FastAPI, HTTPException, Response
 from fastapi.middleware.cors import CORSMiddleware
 from pydantic import BaseModel, Field
 
 from .config import get_settings
 from . import db
-from .services import processor
+from .services import catalog, processor, response_cache, scoring, sharding
 from .services.ingestion import ingest_url
 
 settings = get_settings()
@@ -41,6 +42,8 @@ def startup() -> None:
 
 class SearchRequest(BaseModel):
     query: str = Field(..., min_length=1, description="Natural language search query")
+    limit: int | None = Field(None, ge=1, description="Maximum number of results (all when omitted)")
+    offset: int = Field(0, ge=0, description="Number of ranked results to skip")
 
 
 class ImageResult(BaseModel):
@@ -53,11 +56,19 @@ class ImageResult(BaseModel):
     color: str | None = None
     metadata: dict
     similarity: float | None = None
+    score: float | None = None
 
 
 class SearchResponse(BaseModel):
     filters: Dict[str, str]
     results: List[ImageResult]
+    total: int = 0
+    matched: bool = Field(True, description="False when no image passed the filters and the full catalog was ranked")
+
+
+class CoordinatedSearchResponse(SearchResponse):
+    shards: Dict[str, str]
+    partial: bool
 
 
 class UploadRequest(BaseModel):
@@ -69,38 +80,73 @@ class UploadResponse(BaseModel):
     failures: List[str]
 
 
-def deserialize_vector(blob: bytes) -> np.ndarray:
-    arr = np.frombuffer(blob, dtype=np.float32)
-    return arr
+def cosine_similarities(query: np.ndarray, matrix: np.ndarray, matrix_norms: np.ndarray) -> np.ndarray:
+    norms = matrix_norms * np.linalg.norm(query)
+    dots = matrix @ query.astype(np.float32)
+    return np.divide(dots, norms, out=np.zeros_like(dots), where=norms != 0)
 
 
-def cosine_similarity(a: np.ndarray, b: np.ndarray) -> float:
-    denom = np.linalg.norm(a) * np.linalg.norm(b)
-    if not denom:
-        return 0.0
-    return float(np.dot(a, b) / denom)
+@app.post("/search", response_model=SearchResponse)
+def search(payload: SearchRequest) -> Response:
+    """Return ranked images, served from the response cache while the catalog is unchanged."""
+    # Rank the normalized query so a cached response never differs from a fresh one.
+    payload = payload.model_copy(update={"query": response_cache.normalize_query(payload.query)})
+    index = catalog.get_catalog()
+    cache = response_cache.get_response_cache()
+    if cache is None:
+        return Response(content=run_search(payload, index).model_dump_json(), media_type="application/json")
+
+    # Tag entries with the generation of the index actually ranked, which may lag the
+    # database while a rebuild is in progress.
+    key = response_cache.cache_key(index.catalog_id, payload.query, payload.limit, payload.offset)
+    try:
+        body = cache.get(key, index.generation)
+    except sqlite3.Error:
+        body = None
+    if body is None:
+        body = run_search(payload, index).model_dump_json().encode("utf-8")
+        try:
+            cache.put(key, index.generation, body)
+        except sqlite3.Error:
+            pass
+    return Response(content=body, media_type="application/json")
 
 
-@app.post("/search", response_model=SearchResponse)
-def search(payload: SearchRequest) -> SearchResponse:
-    """Return ranked images based on embedding similarity and attribute filters."""
+def run_search(payload: SearchRequest, index: catalog.CatalogIndex) -> SearchResponse:
+    """Return ranked images scored by embedding similarity and soft attribute filters.
+
+    The whole catalog is scored in one vectorized pass: cosine similarity to the query
+    plus ``filter_weight`` times the mean stored probability of each parsed filter label.
+    Images below ``filter_threshold`` on any filter are dropped, unless none pass, in
+    which case the soft ranking over the full catalog is returned.
+    """
     filters = processor.parse_query_filters(payload.query)
-    
-    # First try exact filter match; if no results, fetch all and rank by similarity
-    records = db.fetch_with_filters(filters)
-    if not records:
-        records = db.fetch_all_embeddings()
+    records = index.rows
 
     if not records:
-        return SearchResponse(filters=filters, results=[])
+        return SearchResponse(filters=filters, results=[], matched=not filters)
 
     query_vector = processor.encode_text(payload.query)
+    similarities = cosine_similarities(query_vector, index.embeddings, index.norms)
+
+    probabilities = scoring.filter_scores(index.scores, filters)
+    matched = True
+    if probabilities.shape[1]:
+        filter_score = probabilities.mean(axis=1)
+        passing = (probabilities >= settings.filter_threshold).all(axis=1)
+        matched = bool(passing.any())
+        candidates = np.flatnonzero(passing) if matched else np.arange(len(records))
+    else:
+        filter_score = np.zeros(len(records), dtype=np.float32)
+        candidates = np.arange(len(records))
+
+    ranking = similarities + settings.filter_weight * filter_score
+    order = candidates[np.argsort(-ranking[candidates], kind="stable")]
+    end = None if payload.limit is None else payload.offset + payload.limit
 
     results: list[ImageResult] = []
-    for row in records:
-        vector = deserialize_vector(row["vector"])
-        similarity = cosine_similarity(query_vector, vector)
-        metadata = json.loads(row["metadata_json"])
+    for position in order[payload.offset : end]:
+        row = records[position]
         results.append(
             ImageResult(
                 id=row["id"],
@@ -110,13 +156,39 @@ def search(payload: SearchRequest) -> SearchResponse:
                 length=row["length"],
                 sleeve_type=row["sleeve_type"],
                 color=row["color"],
-                metadata=metadata,
-                similarity=similarity,
+                metadata=json.loads(row["metadata_json"]),
+                similarity=float(similarities[position]),
+                score=float(ranking[position]),
             )
         )
 
-    results.sort(key=lambda r: r.similarity or 0.0, reverse=True)
-    return SearchResponse(filters=filters, results=results)
+    return SearchResponse(filters=filters, results=results, total=len(order), matched=matched)
+
+
+@app.post("/coordinator/search", response_model=CoordinatedSearchResponse)
+def coordinated_search(payload: SearchRequest) -> CoordinatedSearchResponse:
+    """Fan the query out to every configured shard and merge their ranked results."""
+    if not settings.shard_urls:
+        raise HTTPException(status_code=503, detail="No shards configured (DRESS_SEARCH_SHARD_URLS)")
+
+    filters, results, total, matched, status = sharding.scatter_search(
+        settings.shard_urls,
+        payload.query,
+        payload.limit,
+        payload.offset,
+        settings.shard_timeout,
+    )
+    if not any(value == sharding.STATUS_OK for value in status.values()):
+        raise HTTPException(status_code=502, detail={"shards": status})
+
+    return CoordinatedSearchResponse(
+        filters=filters,
+        results=[ImageResult(**item) for item in results],
+        total=total,
+        matched=matched,
+        shards=status,
+        partial=any(value != sharding.STATUS_OK for value in status.values()),
+    )
 
 
 @app.get("/images", response_model=List[ImageResult])
@@ -0,0 +1,87 @@
+"""In-memory catalog matrices rebuilt only when the index generation changes.
+
+``/search`` scores every image on every request, so the embedding and attribute
+score matrices are decoded from SQLite once per ``(catalog_id, index_generation)``
+and shared by all requests until the next catalog write. After a write the previous
+index keeps serving while a single background thread builds the new one.
+"""
+from __future__ import annotations
+
+import threading
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+
+from .. import db
+from . import scoring
+
+DISPLAY_COLUMNS = ("id", "filename", "file_path", *db.ATTRIBUTE_COLUMNS, "metadata_json")
+
+
+@dataclass(slots=True)
+class CatalogIndex:
+    catalog_id: int
+    generation: int
+    rows: List[Dict[str, object]]
+    embeddings: np.ndarray
+    norms: np.ndarray
+    scores: np.ndarray
+
+
+# Held for the duration of a build, so at most one rebuild runs per process.
+_lock = threading.Lock()
+_current: Optional[CatalogIndex] = None
+
+
+def build_catalog(catalog_id: int, generation: int) -> CatalogIndex:
+    """Decode every stored embedding and score vector into contiguous matrices.
+
+    Only the display columns of each row are kept; the embedding and score blobs are
+    released once they have been copied into the matrices.
+    """
+    rows = db.fetch_catalog()
+    dim = len(rows[0]["vector"]) // 4 if rows else 0
+    embeddings = np.empty((len(rows), dim), dtype=np.float32)
+    for i, row in enumerate(rows):
+        embeddings[i] = np.frombuffer(row["vector"], dtype=np.float32)
+    return CatalogIndex(
+        catalog_id=catalog_id,
+        generation=generation,
+        rows=[{column: row[column] for column in DISPLAY_COLUMNS} for row in rows],
+        embeddings=embeddings,
+        norms=np.linalg.norm(embeddings, axis=1),
+        scores=scoring.quantized_matrix(rows, db.ATTRIBUTE_COLUMNS),
+    )
+
+
+def _rebuild(state: Tuple[int, int]) -> None:
+    """Build ``state`` in the background and publish it; the caller holds ``_lock``."""
+    global _current
+    try:
+        _current = build_catalog(*state)
+    finally:
+        _lock.release()
+
+
+def get_catalog() -> CatalogIndex:
+    """Return the catalog matrices for the current index generation.
+
+    When only the generation moved, the previous index is returned until the
+    background rebuild finishes. The first build, or a different database
+    (``catalog_id``), blocks until its index is ready.
+    """
+    global _current
+    # Read the generation first: a concurrent write can only make the built index stale.
+    state = db.get_index_state()
+    current = _current
+    if current is not None and (current.catalog_id, current.generation) == state:
+        return current
+    if current is not None and current.catalog_id == state[0]:
+        if _lock.acquire(blocking=False):
+            threading.Thread(target=_rebuild, args=(state,), name="catalog-rebuild", daemon=True).start()
+        return current
+    with _lock:
+        if _current is None or (_current.catalog_id, _current.generation) != state:
+            _current = build_catalog(*state)
+        return _current
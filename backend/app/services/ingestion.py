@@ -10,7 +10,7 @@ from requests import Response
 
 from .. import db
 from ..db import ImageRecord
-from . import processor
+from . import processor, scoring
 
 IMAGES_DIR = Path(__file__).resolve().parents[2] / "images"
 
@@ -33,8 +33,8 @@ def ingest_url(url: str) -> ImageRecord:
     """Download an image, extract attributes, and persist to SQLite."""
     image_path = download_image(url)
     pil_image = processor.load_image(image_path)
-    attributes = processor.zero_shot_classify(pil_image)
-    embedding = processor.encode_image(pil_image).astype(np.float32).tobytes()
+    embedding = processor.encode_image(pil_image)
+    attributes, probabilities = processor.classify_embedding(embedding)
 
     metadata = {
         "source_url": url,
@@ -51,5 +51,10 @@ def ingest_url(url: str) -> ImageRecord:
         metadata_json=json.dumps(metadata),
     )
 
-    db.insert_image(record, embedding)
+    db.insert_image(
+        record,
+        embedding.astype(np.float32).tobytes(),
+        scores=scoring.quantize(probabilities),
+        score_layout=scoring.SCORE_LAYOUT,
+    )
     return record
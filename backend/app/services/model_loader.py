@@ -1,25 +1,128 @@
-"""Model loader that ensures heavyweight artifacts are loaded once."""
+"""Model loader that ensures heavyweight artifacts are loaded once.
+
+The bundle is role-aware so each process only pays for the towers it calls:
+
+* ``all``    – full CLIP model and spaCy (default, single-process deployments).
+* ``query``  – CLIP text tower, tokenizer and spaCy (search replicas).
+* ``ingest`` – CLIP vision tower plus the persisted taxonomy prompt table.
+"""
 from __future__ import annotations
 
 from functools import lru_cache
+from pathlib import Path
 
-from sentence_transformers import SentenceTransformer
-import spacy
+from ..config import get_settings, resolve_path
+from .prompt_table import PromptTable, get_prompt_table
 
 
 CLIP_MODEL_NAME = "clip-ViT-B-32"
 SPACY_MODEL_NAME = "en_core_web_sm"
+BACKEND_TORCH = "torch"
+BACKEND_ONNX = "onnx"
+ROLE_ALL = "all"
+ROLE_QUERY = "query"
+ROLE_INGEST = "ingest"
+
+
+def onnx_model_dir() -> Path:
+    """Return the configured directory for exported ONNX towers."""
+    return resolve_path(get_settings().onnx_dir)
+
+
+def model_signature() -> str:
+    """Identify the encoder producing embeddings, including backend and precision."""
+    settings = get_settings()
+    if settings.clip_backend == BACKEND_ONNX:
+        precision = "int8" if settings.onnx_quantized else "fp32"
+        return f"{CLIP_MODEL_NAME}/{BACKEND_ONNX}-{precision}"
+    return f"{CLIP_MODEL_NAME}/{settings.clip_backend}"
+
+
+def load_sentence_transformer():
+    """Load the reference sentence-transformers CLIP model (imports torch lazily)."""
+    from sentence_transformers import SentenceTransformer
+
+    return SentenceTransformer(CLIP_MODEL_NAME)
+
+
+def load_text_encoder(backend: str):
+    """Load only the CLIP text tower for the given backend."""
+    if backend == BACKEND_TORCH:
+        from .torch_backend import TorchTextEncoder, clip_checkpoint_path
+
+        return TorchTextEncoder(clip_checkpoint_path())
+    if backend == BACKEND_ONNX:
+        from .onnx_backend import OnnxTextEncoder
+
+        return OnnxTextEncoder(onnx_model_dir(), quantized=get_settings().onnx_quantized)
+    raise ValueError(f"Unknown CLIP backend: {backend!r}")
+
+
+def load_image_encoder(backend: str):
+    """Load only the CLIP vision tower for the given backend."""
+    if backend == BACKEND_TORCH:
+        from .torch_backend import TorchImageEncoder, clip_checkpoint_path
+
+        return TorchImageEncoder(clip_checkpoint_path())
+    if backend == BACKEND_ONNX:
+        from .onnx_backend import OnnxImageEncoder
+
+        return OnnxImageEncoder(onnx_model_dir(), quantized=get_settings().onnx_quantized)
+    raise ValueError(f"Unknown CLIP backend: {backend!r}")
 
 
 class ModelBundle:
     """Container for all ML artifacts used by the service."""
 
-    def __init__(self) -> None:
-        self.clip = SentenceTransformer(CLIP_MODEL_NAME)
-        self.nlp = spacy.load(SPACY_MODEL_NAME)
+    def __init__(self, role: str = ROLE_ALL) -> None:
+        self.backend = get_settings().clip_backend
+        self.role = role
+        self.text_encoder = None
+        self.image_encoder = None
+        self.nlp = None
+        self._prompt_table: PromptTable | None = None
+
+        if role == ROLE_ALL:
+            if self.backend == BACKEND_TORCH:
+                clip = load_sentence_transformer()
+                self.text_encoder = clip
+                self.image_encoder = clip
+            else:
+                self.text_encoder = load_text_encoder(self.backend)
+                self.image_encoder = load_image_encoder(self.backend)
+            self.nlp = self._load_spacy()
+        elif role == ROLE_QUERY:
+            self.text_encoder = load_text_encoder(self.backend)
+            self.nlp = self._load_spacy()
+        elif role == ROLE_INGEST:
+            self.image_encoder = load_image_encoder(self.backend)
+            # The text tower is only loaded (and then dropped) if the prompt table is not cached yet.
+            self._prompt_table = get_prompt_table(model_signature(), lambda: load_text_encoder(self.backend))
+        else:
+            raise ValueError(f"Unknown model role: {role!r}")
+
+    @staticmethod
+    def _load_spacy():
+        import spacy
+
+        return spacy.load(SPACY_MODEL_NAME)
+
+    def require(self, name: str):
+        """Return a loaded artifact or explain which role provides it."""
+        artifact = getattr(self, name)
+        if artifact is None:
+            raise RuntimeError(f"Model role {self.role!r} does not load {name}")
+        return artifact
+
+    @property
+    def prompt_table(self) -> PromptTable:
+        """Return the taxonomy prompt table, loading or building it on first use."""
+        if self._prompt_table is None:
+            self._prompt_table = get_prompt_table(model_signature(), lambda: self.require("text_encoder"))
+        return self._prompt_table
 
 
 @lru_cache(maxsize=1)
 def get_models() -> ModelBundle:
-    """Return a cached bundle of models."""
-    return ModelBundle()
+    """Return a cached bundle of models for the configured role."""
+    return ModelBundle(get_settings().model_role)
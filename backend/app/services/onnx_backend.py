@@ -0,0 +1,210 @@
+"""ONNX Runtime inference backend for the CLIP text and image towers.
+
+The towers are exported from the same sentence-transformers checkpoint used by the
+torch backend, optionally with dynamic int8 weight quantization for CPU hosts.
+Encoders mirror the ``SentenceTransformer.encode`` contract used by ``processor``:
+a single input returns a 1-D float32 vector, a list returns a 2-D matrix.
+"""
+from __future__ import annotations
+
+from pathlib import Path
+from typing import Dict, List, Sequence
+
+import numpy as np
+from PIL import Image
+
+TEXT_MODEL_FILENAME = "text.onnx"
+IMAGE_MODEL_FILENAME = "image.onnx"
+QUANTIZED_SUFFIX = ".int8.onnx"
+OPSET_VERSION = 14
+MAX_TEXT_TOKENS = 77
+
+
+def tower_path(model_dir: Path, filename: str, quantized: bool) -> Path:
+    """Return the on-disk path of an exported tower."""
+    path = model_dir / filename
+    return path.with_suffix(QUANTIZED_SUFFIX) if quantized else path
+
+
+def _create_session(path: Path):
+    import onnxruntime as ort
+
+    if not path.exists():
+        raise FileNotFoundError(f"ONNX model not found at {path}; run export_onnx.py first")
+    return ort.InferenceSession(str(path), providers=["CPUExecutionProvider"])
+
+
+def _batched(items: Sequence, batch_size: int):
+    for start in range(0, len(items), batch_size):
+        yield items[start : start + batch_size]
+
+
+class OnnxTextEncoder:
+    """CLIP text tower served by ONNX Runtime."""
+
+    def __init__(self, model_dir: Path, quantized: bool = True) -> None:
+        from transformers import CLIPTokenizer
+
+        self.tokenizer = CLIPTokenizer.from_pretrained(model_dir)
+        self.session = _create_session(tower_path(model_dir, TEXT_MODEL_FILENAME, quantized))
+
+    def encode(self, sentences, batch_size: int = 32, convert_to_numpy: bool = True) -> np.ndarray:
+        single = isinstance(sentences, str)
+        texts: List[str] = [sentences] if single else list(sentences)
+        outputs = []
+        for batch in _batched(texts, batch_size):
+            tokens = self.tokenizer(
+                batch, padding=True, truncation=True, max_length=MAX_TEXT_TOKENS, return_tensors="np"
+            )
+            (embeddings,) = self.session.run(
+                None,
+                {
+                    "input_ids": tokens["input_ids"].astype(np.int64),
+                    "attention_mask": tokens["attention_mask"].astype(np.int64),
+                },
+            )
+            outputs.append(embeddings)
+        result = np.concatenate(outputs).astype(np.float32)
+        return result[0] if single else result
+
+
+class OnnxImageEncoder:
+    """CLIP vision tower served by ONNX Runtime."""
+
+    def __init__(self, model_dir: Path, quantized: bool = True) -> None:
+        from transformers import CLIPImageProcessor
+
+        self.image_processor = CLIPImageProcessor.from_pretrained(model_dir)
+        self.session = _create_session(tower_path(model_dir, IMAGE_MODEL_FILENAME, quantized))
+
+    def encode(self, images, batch_size: int = 32, convert_to_numpy: bool = True) -> np.ndarray:
+        single = isinstance(images, Image.Image)
+        items: List[Image.Image] = [images] if single else list(images)
+        outputs = []
+        for batch in _batched(items, batch_size):
+            pixels = self.image_processor(images=batch, return_tensors="np")["pixel_values"]
+            (embeddings,) = self.session.run(None, {"pixel_values": pixels.astype(np.float32)})
+            outputs.append(embeddings)
+        result = np.concatenate(outputs).astype(np.float32)
+        return result[0] if single else result
+
+
+def export_onnx(output_dir: Path, quantize: bool = True) -> List[Path]:
+    """Export the CLIP text and image towers to ONNX and optionally quantize them to int8."""
+    import torch
+    from onnxruntime.quantization import QuantType, quantize_dynamic
+
+    from .model_loader import load_sentence_transformer
+
+    clip_module = load_sentence_transformer()[0]
+    model = clip_module.model.eval()
+    processor = clip_module.processor
+
+    class TextTower(torch.nn.Module):
+        def __init__(self) -> None:
+            super().__init__()
+            self.clip = model
+
+        def forward(self, input_ids, attention_mask):
+            return self.clip.get_text_features(input_ids=input_ids, attention_mask=attention_mask)
+
+    class ImageTower(torch.nn.Module):
+        def __init__(self) -> None:
+            super().__init__()
+            self.clip = model
+
+        def forward(self, pixel_values):
+            return self.clip.get_image_features(pixel_values=pixel_values)
+
+    output_dir.mkdir(parents=True, exist_ok=True)
+    processor.save_pretrained(output_dir)
+
+    text_path = output_dir / TEXT_MODEL_FILENAME
+    tokens = processor.tokenizer(["a red dress", "a long sleeve dress"], padding=True, return_tensors="pt")
+    with torch.no_grad():
+        torch.onnx.export(
+            TextTower(),
+            (tokens["input_ids"], tokens["attention_mask"]),
+            str(text_path),
+            input_names=["input_ids", "attention_mask"],
+            output_names=["embeddings"],
+            dynamic_axes={
+                "input_ids": {0: "batch", 1: "sequence"},
+                "attention_mask": {0: "batch", 1: "sequence"},
+                "embeddings": {0: "batch"},
+            },
+            opset_version=OPSET_VERSION,
+        )
+
+    image_path = output_dir / IMAGE_MODEL_FILENAME
+    pixels = processor.image_processor(images=[Image.new("RGB", (224, 224))], return_tensors="pt")["pixel_values"]
+    with torch.no_grad():
+        torch.onnx.export(
+            ImageTower(),
+            (pixels,),
+            str(image_path),
+            input_names=["pixel_values"],
+            output_names=["embeddings"],
+            dynamic_axes={"pixel_values": {0: "batch"}, "embeddings": {0: "batch"}},
+            opset_version=OPSET_VERSION,
+        )
+
+    written = [text_path, image_path]
+    if quantize:
+        for path in (text_path, image_path):
+            target = path.with_suffix(QUANTIZED_SUFFIX)
+            quantize_dynamic(str(path), str(target), weight_type=QuantType.QInt8)
+            written.append(target)
+    return written
+
+
+def _rowwise_cosine(a: np.ndarray, b: np.ndarray) -> np.ndarray:
+    a = a / np.linalg.norm(a, axis=1, keepdims=True)
+    b = b / np.linalg.norm(b, axis=1, keepdims=True)
+    return np.sum(a * b, axis=1)
+
+
+def _summarize(cosines: np.ndarray) -> Dict[str, float]:
+    return {
+        "count": int(cosines.size),
+        "mean_cosine": float(cosines.mean()),
+        "min_cosine": float(cosines.min()),
+        "max_drift": float(1.0 - cosines.min()),
+    }
+
+
+def encoder_parity(
+    texts: Sequence[str],
+    images: Sequence[Image.Image],
+    text_encoder,
+    image_encoder,
+) -> Dict[str, Dict[str, float]]:
+    """Compare any pair of tower encoders against the sentence-transformers reference."""
+    from .model_loader import load_sentence_transformer
+
+    reference = load_sentence_transformer()
+    report: Dict[str, Dict[str, float]] = {}
+    if texts:
+        candidate = text_encoder.encode(list(texts))
+        expected = reference.encode(list(texts), convert_to_numpy=True)
+        report["text"] = _summarize(_rowwise_cosine(expected, candidate))
+    if images:
+        candidate = image_encoder.encode(list(images))
+        expected = reference.encode(list(images), convert_to_numpy=True)
+        report["image"] = _summarize(_rowwise_cosine(expected, candidate))
+    return report
+
+
+def parity_report(
+    texts: Sequence[str],
+    images: Sequence[Image.Image],
+    model_dir: Path,
+    quantized: bool = True,
+) -> Dict[str, Dict[str, float]]:
+    """Compare ONNX embeddings against the torch reference and report per-tower cosine drift."""
+    return encoder_parity(
+        texts,
+        images,
+        OnnxTextEncoder(model_dir, quantized=quantized),
+        OnnxImageEncoder(model_dir, quantized=quantized),
+    )
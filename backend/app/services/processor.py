@@ -1,25 +1,14 @@
 """Image and query processing utilities."""
 from __future__ import annotations
 
-import json
 from pathlib import Path
-from typing import Dict
+from typing import Dict, Tuple
 
 import numpy as np
 from PIL import Image
-from sentence_transformers.util import cos_sim
 
 from .model_loader import get_models
-
-
-def load_taxonomy() -> Dict[str, list]:
-    """Load fashion attribute taxonomy from taxonomy.json."""
-    taxonomy_path = Path(__file__).resolve().parents[2] / "taxonomy.json"
-    with open(taxonomy_path, "r") as f:
-        return json.load(f)
-
-
-TAXONOMY = load_taxonomy()
+from .taxonomy import TAXONOMY, load_taxonomy  # noqa: F401  (re-exported for scripts)
 
 
 def load_image(image_path: Path) -> Image.Image:
@@ -31,28 +20,25 @@ def load_image(image_path: Path) -> Image.Image:
 def encode_image(image: Image.Image) -> np.ndarray:
     """Return the CLIP embedding for an image."""
     models = get_models()
-    return models.clip.encode(image, convert_to_numpy=True)
+    return models.require("image_encoder").encode(image, convert_to_numpy=True)
 
 
 def encode_text(text: str) -> np.ndarray:
     """Return the CLIP embedding for a text query."""
     models = get_models()
-    return models.clip.encode(text, convert_to_numpy=True)
+    return models.require("text_encoder").encode(text, convert_to_numpy=True)
 
 
-def zero_shot_classify(image: Image.Image) -> Dict[str, str]:
-    """Derive fashion attributes via zero-shot prompts."""
-    models = get_models()
-    img_emb = models.clip.encode(image, convert_to_tensor=True)
-    attributes: Dict[str, str] = {}
+def classify_embedding(embedding: np.ndarray) -> Tuple[Dict[str, str], np.ndarray]:
+    """Return the best label per category and the full per-label probability vector."""
+    table = get_models().prompt_table
+    probabilities = table.probabilities(embedding)
+    return table.best_labels(probabilities[np.newaxis, :])[0], probabilities
 
-    for category, labels in TAXONOMY.items():
-        prompts = [f"a {label} dress" for label in labels]
-        text_emb = models.clip.encode(prompts, convert_to_tensor=True)
-        scores = cos_sim(img_emb, text_emb)[0]
-        best_idx = int(scores.argmax())
-        attributes[category] = labels[best_idx]
 
+def zero_shot_classify(image: Image.Image) -> Dict[str, str]:
+    """Derive fashion attributes by scoring the image against the cached prompt table."""
+    attributes, _ = classify_embedding(encode_image(image))
     return attributes
 
 
@@ -60,7 +46,7 @@ def parse_query_filters(query: str) -> Dict[str, str]:
     """Extract structured attribute hints from a free-text query."""
     filters: Dict[str, str] = {}
     models = get_models()
-    doc = models.nlp(query.lower())
+    doc = models.require("nlp")(query.lower())
     haystacks = {
         " ".join(token.text for token in doc),
         " ".join(token.lemma_ for token in doc),
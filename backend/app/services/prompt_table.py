@@ -0,0 +1,128 @@
+"""Precomputed taxonomy prompt embeddings persisted on disk.
+
+Prompt embeddings depend only on ``taxonomy.json``, the prompt templates and the
+text encoder, so they are encoded once and cached under ``settings.cache_dir`` keyed
+by a hash of all three. Zero-shot classification then reduces to one image
+embedding multiplied by a small fixed ``(labels, dim)`` matrix.
+"""
+from __future__ import annotations
+
+import gc
+import hashlib
+import json
+import os
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Callable, Dict, List, Sequence
+
+import numpy as np
+
+from ..config import get_settings, resolve_path
+from .taxonomy import TAXONOMY, build_prompts, taxonomy_hash
+
+TABLE_PREFIX = "prompt_table_"
+# CLIP's learned temperature; turns cosine scores into per-category label probabilities.
+LOGIT_SCALE = 100.0
+
+
+def _normalize(matrix: np.ndarray) -> np.ndarray:
+    norms = np.linalg.norm(matrix, axis=-1, keepdims=True)
+    return matrix / np.where(norms == 0, 1.0, norms)
+
+
+@dataclass(slots=True)
+class PromptTable:
+    """L2-normalized label embeddings laid out category by category."""
+
+    categories: List[str]
+    labels: List[List[str]]
+    matrix: np.ndarray
+    offsets: np.ndarray
+
+    def category_slice(self, index: int) -> slice:
+        return slice(int(self.offsets[index]), int(self.offsets[index + 1]))
+
+    def scores(self, embeddings: np.ndarray) -> np.ndarray:
+        """Return cosine scores of one ``(dim,)`` or many ``(n, dim)`` embeddings against every label."""
+        return _normalize(np.asarray(embeddings, dtype=np.float32)) @ self.matrix.T
+
+    def probabilities(self, embeddings: np.ndarray) -> np.ndarray:
+        """Return per-category softmax probabilities over labels, laid out like ``matrix`` rows."""
+        logits = self.scores(embeddings) * LOGIT_SCALE
+        probs = np.empty_like(logits)
+        for i in range(len(self.categories)):
+            part = logits[..., self.category_slice(i)]
+            part = np.exp(part - part.max(axis=-1, keepdims=True))
+            probs[..., self.category_slice(i)] = part / part.sum(axis=-1, keepdims=True)
+        return probs
+
+    def best_labels(self, probabilities: np.ndarray) -> List[Dict[str, str]]:
+        """Return the best label per category for each row of a ``(n, labels)`` probability matrix."""
+        columns = [
+            [self.labels[i][index] for index in probabilities[:, self.category_slice(i)].argmax(axis=1)]
+            for i in range(len(self.categories))
+        ]
+        return [dict(zip(self.categories, values)) for values in zip(*columns)]
+
+
+def table_key(model_signature: str, templates: Sequence[str]) -> str:
+    """Return the cache key for a taxonomy/model/template combination."""
+    payload = json.dumps([taxonomy_hash(), model_signature, list(templates)])
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()[:16]
+
+
+def table_path(model_signature: str, templates: Sequence[str]) -> Path:
+    return resolve_path(get_settings().cache_dir) / f"{TABLE_PREFIX}{table_key(model_signature, templates)}.npz"
+
+
+def build_prompt_table(text_encoder, templates: Sequence[str]) -> PromptTable:
+    """Encode every label under every template and average the normalized embeddings."""
+    categories = list(TAXONOMY.keys())
+    labels = [list(TAXONOMY[category]) for category in categories]
+    flat_labels = [label for group in labels for label in group]
+
+    ensemble = None
+    for template in templates:
+        encoded = _normalize(text_encoder.encode(build_prompts(flat_labels, template), convert_to_numpy=True))
+        ensemble = encoded if ensemble is None else ensemble + encoded
+
+    offsets = np.cumsum([0] + [len(group) for group in labels]).astype(np.int64)
+    return PromptTable(categories, labels, _normalize(ensemble).astype(np.float32), offsets)
+
+
+def save_prompt_table(table: PromptTable, path: Path) -> None:
+    """Write a table atomically so concurrent workers never read a partial file."""
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = path.with_suffix(f".{os.getpid()}.tmp.npz")
+    np.savez(
+        tmp_path,
+        matrix=table.matrix,
+        offsets=table.offsets,
+        layout=np.array(json.dumps({"categories": table.categories, "labels": table.labels})),
+    )
+    os.replace(tmp_path, path)
+
+
+def load_prompt_table(path: Path) -> PromptTable:
+    with np.load(path) as data:
+        layout = json.loads(str(data["layout"]))
+        return PromptTable(layout["categories"], layout["labels"], data["matrix"], data["offsets"])
+
+
+def get_prompt_table(model_signature: str, load_encoder: Callable[[], object]) -> PromptTable:
+    """Load the cached table for the current taxonomy, encoding and persisting it on a miss.
+
+    ``load_encoder`` is only called on a cache miss, so processes that never need the
+    text tower (ingest workers) skip loading it entirely once the table exists.
+    """
+    templates = get_settings().prompt_templates
+    path = table_path(model_signature, templates)
+    if path.exists():
+        return load_prompt_table(path)
+
+    text_encoder = load_encoder()
+    table = build_prompt_table(text_encoder, templates)
+    del text_encoder
+    gc.collect()
+    save_prompt_table(table, path)
+    return table
@@ -0,0 +1,64 @@
+"""Re-derive stored attributes from existing embeddings after taxonomy changes.
+
+Image embeddings are already persisted, so updating ``taxonomy.json`` only requires
+scoring the stored vectors against the new prompt table. The job walks the
+``embeddings`` table in id order, classifies each chunk with one matrix product and
+writes the chunk plus its checkpoint in a single transaction, so it can be
+interrupted and resumed at any time. Running API workers keep the taxonomy they
+loaded at startup, so they must be restarted once the job finishes: until then they
+ignore the new score vectors and cannot parse newly added labels.
+"""
+from __future__ import annotations
+
+import json
+from typing import Callable, Optional
+
+import numpy as np
+
+from .. import db
+from ..config import get_settings
+from .model_loader import load_text_encoder, model_signature
+from . import scoring
+from .prompt_table import get_prompt_table, table_key
+
+JOB_NAME = "reclassify"
+DEFAULT_CHUNK_SIZE = 4096
+
+
+def reclassify_catalog(
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+    restart: bool = False,
+    progress: Optional[Callable[[int, int], None]] = None,
+) -> int:
+    """Recompute attribute columns for every stored embedding and return the number updated."""
+    settings = get_settings()
+    signature = model_signature()
+    table = get_prompt_table(signature, lambda: load_text_encoder(settings.clip_backend))
+    job_signature = table_key(signature, settings.prompt_templates)
+
+    last_id = 0 if restart else db.get_job_checkpoint(JOB_NAME, job_signature)
+    processed = 0
+    while True:
+        rows = db.fetch_embedding_chunk(last_id, chunk_size)
+        if not rows:
+            break
+
+        ids = [int(row["image_id"]) for row in rows]
+        vectors = np.frombuffer(b"".join(row["vector"] for row in rows), dtype=np.float32)
+        vectors = vectors.reshape(len(rows), -1)
+        probabilities = table.probabilities(vectors)
+
+        updates = []
+        scores = []
+        for position, (image_id, attributes) in enumerate(zip(ids, table.best_labels(probabilities))):
+            columns = [attributes.get(column, "Unknown") for column in db.ATTRIBUTE_COLUMNS]
+            updates.append((*columns, json.dumps(attributes), image_id))
+            scores.append((image_id, scoring.SCORE_LAYOUT, scoring.quantize(probabilities[position])))
+
+        last_id = ids[-1]
+        db.update_attributes(updates, scores, JOB_NAME, job_signature, last_id)
+        processed += len(rows)
+        if progress is not None:
+            progress(processed, last_id)
+
+    return processed
@@ -0,0 +1,183 @@
+"""Full-response cache for ``/search`` validated against the catalog index generation.
+
+Entries are keyed by the catalog (database path and its random ``catalog_id``), the
+encoder signature, the normalized query, paging and ranking parameters, and tagged
+with the ``index_generation`` current when they were computed. Every catalog write
+bumps the generation, so stale entries are simply skipped (and dropped) on lookup
+instead of flushing the whole cache. Callers rank the normalized query itself, so
+parsed filters are a deterministic function of it and the taxonomy hash in the key.
+"""
+from __future__ import annotations
+
+import hashlib
+import json
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from functools import lru_cache
+from pathlib import Path
+from typing import Optional, Tuple
+
+from .. import db
+from ..config import get_settings, resolve_path
+from .model_loader import model_signature
+from .taxonomy import taxonomy_hash
+
+BACKEND_MEMORY = "memory"
+BACKEND_SQLITE = "sqlite"
+BACKEND_NONE = "none"
+# Minimum seconds between access-time refreshes of an on-disk entry.
+ACCESS_RESOLUTION = 60.0
+# Lock wait for best-effort writes that must never delay a lookup.
+BEST_EFFORT_TIMEOUT = 0.05
+
+
+def normalize_query(query: str) -> str:
+    """Lower-case and collapse whitespace so equivalent spellings share one cache entry.
+
+    ``/search`` ranks the normalized form, so cached and uncached responses agree.
+    """
+    return " ".join(query.lower().split())
+
+
+def cache_key(catalog_id: int, query: str, limit: Optional[int], offset: int) -> str:
+    settings = get_settings()
+    payload = json.dumps(
+        [
+            str(db.get_db_path().resolve()),
+            catalog_id,
+            model_signature(),
+            normalize_query(query),
+            limit,
+            offset,
+            settings.filter_threshold,
+            settings.filter_weight,
+            taxonomy_hash(),
+        ]
+    )
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+class MemoryCache:
+    """Per-process LRU cache bounded by the total size of stored payloads."""
+
+    def __init__(self, max_bytes: int) -> None:
+        self.max_bytes = max_bytes
+        self._entries: "OrderedDict[str, Tuple[int, bytes]]" = OrderedDict()
+        self._size = 0
+        self._lock = threading.Lock()
+
+    def get(self, key: str, generation: int) -> Optional[bytes]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            if entry[0] != generation:
+                self._remove(key)
+                return None
+            self._entries.move_to_end(key)
+            return entry[1]
+
+    def put(self, key: str, generation: int, payload: bytes) -> None:
+        if len(payload) > self.max_bytes:
+            return
+        with self._lock:
+            if key in self._entries:
+                self._remove(key)
+            self._entries[key] = (generation, payload)
+            self._size += len(payload)
+            while self._size > self.max_bytes:
+                self._remove(next(iter(self._entries)))
+
+    def _remove(self, key: str) -> None:
+        _, payload = self._entries.pop(key)
+        self._size -= len(payload)
+
+
+class SqliteCache:
+    """On-disk cache shared by every uvicorn worker on the host."""
+
+    def __init__(self, path: Path, max_bytes: int) -> None:
+        self.path = path
+        self.max_bytes = max_bytes
+        with self._connect() as conn:
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute(
+                """
+                CREATE TABLE IF NOT EXISTS response_cache (
+                    key TEXT PRIMARY KEY,
+                    generation INTEGER NOT NULL,
+                    payload BLOB NOT NULL,
+                    accessed REAL NOT NULL
+                )
+                """
+            )
+            conn.commit()
+
+    def _connect(self, timeout: float = 5.0) -> sqlite3.Connection:
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        return sqlite3.connect(self.path, timeout=timeout)
+
+    def get(self, key: str, generation: int) -> Optional[bytes]:
+        with self._connect() as conn:
+            row = conn.execute(
+                "SELECT generation, payload, accessed FROM response_cache WHERE key = ?", (key,)
+            ).fetchone()
+        if row is None:
+            return None
+        if row[0] != generation:
+            self._best_effort("DELETE FROM response_cache WHERE key = ? AND generation = ?", (key, row[0]))
+            return None
+        now = time.time()
+        if now - row[2] > ACCESS_RESOLUTION:
+            self._best_effort("UPDATE response_cache SET accessed = ? WHERE key = ?", (now, key))
+        return row[1]
+
+    def _best_effort(self, statement: str, params: tuple) -> None:
+        """Run a bookkeeping write, skipping it if another worker holds the write lock."""
+        try:
+            with self._connect(timeout=BEST_EFFORT_TIMEOUT) as conn:
+                conn.execute(statement, params)
+                conn.commit()
+        except sqlite3.OperationalError:
+            pass
+
+    def put(self, key: str, generation: int, payload: bytes) -> None:
+        if len(payload) > self.max_bytes:
+            return
+        with self._connect() as conn:
+            conn.execute(
+                """
+                INSERT OR REPLACE INTO response_cache (key, generation, payload, accessed)
+                VALUES (?, ?, ?, ?)
+                """,
+                (key, generation, payload, time.time()),
+            )
+            # Evict least recently used entries beyond the byte budget.
+            conn.execute(
+                """
+                DELETE FROM response_cache WHERE key IN (
+                    SELECT key FROM (
+                        SELECT key, SUM(length(payload)) OVER (ORDER BY accessed DESC) AS running
+                        FROM response_cache
+                    ) WHERE running > ?
+                )
+                """,
+                (self.max_bytes,),
+            )
+            conn.commit()
+
+
+@lru_cache(maxsize=1)
+def get_response_cache() -> MemoryCache | SqliteCache | None:
+    """Return the configured response cache, or ``None`` when caching is disabled."""
+    settings = get_settings()
+    backend = settings.response_cache_backend
+    if backend == BACKEND_NONE:
+        return None
+    if backend == BACKEND_MEMORY:
+        return MemoryCache(settings.response_cache_max_bytes)
+    if backend == BACKEND_SQLITE:
+        return SqliteCache(resolve_path(settings.response_cache_path), settings.response_cache_max_bytes)
+    raise ValueError(f"Unknown response cache backend: {backend!r}")
@@ -0,0 +1,60 @@
+"""Compact per-label attribute probabilities and confidence-aware filter scoring.
+
+Each image stores one uint8 per taxonomy label (probability * 255), concatenated
+category by category in taxonomy order. ``SCORE_LAYOUT`` identifies that order so
+vectors written under an older taxonomy are ignored until re-classification.
+"""
+from __future__ import annotations
+
+from typing import Dict, Mapping, Sequence, Tuple
+
+import numpy as np
+
+from .taxonomy import TAXONOMY, taxonomy_hash
+
+SCORE_LAYOUT = taxonomy_hash()
+LABEL_INDEX: Dict[Tuple[str, str], int] = {
+    key: index
+    for index, key in enumerate((category, label) for category, labels in TAXONOMY.items() for label in labels)
+}
+LABEL_COUNT = len(LABEL_INDEX)
+
+
+def quantize(probabilities: np.ndarray) -> bytes:
+    """Encode a ``(labels,)`` probability vector as uint8 bytes."""
+    return np.round(np.clip(probabilities, 0.0, 1.0) * 255).astype(np.uint8).tobytes()
+
+
+def quantized_matrix(rows: Sequence, columns: Sequence[str]) -> np.ndarray:
+    """Return a ``(rows, labels)`` uint8 matrix of stored attribute probabilities.
+
+    Rows without scores in the current layout fall back to a one-hot vector built from
+    their argmax attribute columns.
+    """
+    quantized = np.zeros((len(rows), LABEL_COUNT), dtype=np.uint8)
+    stored = [i for i, row in enumerate(rows) if row["score_layout"] == SCORE_LAYOUT and row["scores"]]
+    if stored:
+        blob = b"".join(rows[i]["scores"] for i in stored)
+        quantized[stored] = np.frombuffer(blob, dtype=np.uint8).reshape(len(stored), LABEL_COUNT)
+
+    stored_set = set(stored)
+    for i in range(len(rows)):
+        if i in stored_set:
+            continue
+        row = rows[i]
+        for column in columns:
+            index = LABEL_INDEX.get((column, row[column]))
+            if index is not None:
+                quantized[i, index] = 255
+    return quantized
+
+
+def filter_scores(scores: np.ndarray, filters: Mapping[str, str]) -> np.ndarray:
+    """Return a ``(rows, filters)`` float32 matrix with each row's probability of every requested label.
+
+    Only the requested columns of the uint8 ``scores`` matrix are converted.
+    """
+    indices = [LABEL_INDEX[(category, label)] for category, label in filters.items() if (category, label) in LABEL_INDEX]
+    if not indices:
+        return np.ones((scores.shape[0], 0), dtype=np.float32)
+    return scores[:, indices].astype(np.float32) / 255.0
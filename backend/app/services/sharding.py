@@ -0,0 +1,143 @@
+"""Partition the catalog database into shard files and scatter-gather searches across them.
+
+Each shard is a regular ``dress_search.db`` served by its own instance of the API
+(``DRESS_SEARCH_DB_PATH`` pointing at the shard file). Image ids are preserved when
+splitting, so results from different shards never collide. New images should be
+ingested into the source database and re-split, since per-shard autoincrement ids
+are not coordinated.
+"""
+from __future__ import annotations
+
+import hashlib
+from concurrent.futures import ThreadPoolExecutor, wait
+from pathlib import Path
+from typing import Dict, List, Tuple
+
+import requests
+
+from .. import db
+
+SHARD_KEYS = ("id", *db.ATTRIBUTE_COLUMNS)
+STATUS_OK = "ok"
+STATUS_TIMEOUT = "timeout"
+STATUS_ERROR = "error"
+
+# Shared pool so a slow shard never blocks the caller past its timeout.
+_EXECUTOR = ThreadPoolExecutor(max_workers=32, thread_name_prefix="shard")
+
+
+def shard_for(value: object, shards: int) -> int:
+    """Return a stable shard index for a partition key value."""
+    digest = hashlib.blake2b(str(value).encode("utf-8"), digest_size=8).digest()
+    return int.from_bytes(digest, "big") % shards
+
+
+def shard_db_path(output_dir: Path, index: int) -> Path:
+    return output_dir / f"shard_{index}.db"
+
+
+def split_database(source: Path, output_dir: Path, shards: int, key: str = "id") -> List[Path]:
+    """Copy every image, embedding and score row of ``source`` into ``shards`` new databases."""
+    if key not in SHARD_KEYS:
+        raise ValueError(f"Unsupported shard key {key!r}; expected one of {SHARD_KEYS}")
+
+    if not source.exists():
+        raise FileNotFoundError(f"Source database {source} does not exist")
+    paths = [shard_db_path(output_dir, index) for index in range(shards)]
+    existing = [path for path in paths if path.exists()]
+    if existing:
+        raise FileExistsError(f"Refusing to overwrite existing shards: {', '.join(map(str, existing))}")
+
+    # Databases created before newer tables (e.g. attribute_scores) need them before copying.
+    with db.connect(source) as conn:
+        db.apply_schema(conn)
+
+    for index, path in enumerate(paths):
+        with db.connect(path) as conn:
+            db.apply_schema(conn)
+            conn.create_function("shard_for", 1, lambda value: shard_for(value, shards), deterministic=True)
+            conn.execute("ATTACH DATABASE ? AS src", (str(source),))
+            conn.execute(f"INSERT INTO images SELECT * FROM src.images WHERE shard_for({key}) = ?", (index,))
+            conn.execute(
+                """
+                INSERT INTO embeddings
+                SELECT e.* FROM src.embeddings AS e JOIN images ON images.id = e.image_id
+                """
+            )
+            conn.execute(
+                """
+                INSERT INTO attribute_scores
+                SELECT s.* FROM src.attribute_scores AS s JOIN images ON images.id = s.image_id
+                """
+            )
+            conn.commit()
+            conn.execute("DETACH DATABASE src")
+    return paths
+
+
+def _query_shard(url: str, payload: dict, timeout: float) -> dict:
+    response = requests.post(f"{url.rstrip('/')}/search", json=payload, timeout=timeout)
+    response.raise_for_status()
+    return response.json()
+
+
+def _rank_key(item: dict) -> Tuple[float, int]:
+    """Order by descending score, then ascending id like a single node's stable ranking."""
+    score = item.get("score")
+    if score is None:
+        score = item.get("similarity")
+    return -(score if score is not None else 0.0), item.get("id", 0)
+
+
+def scatter_search(
+    shard_urls: List[str],
+    query: str,
+    limit: int | None,
+    offset: int,
+    timeout: float,
+) -> Tuple[Dict[str, str], List[dict], int, bool, Dict[str, str]]:
+    """Fan a query out to every shard and merge their top results by score.
+
+    Each shard is asked for its first ``offset + limit`` results, which is enough to
+    produce the merged page. Shards that fell back to their full catalog
+    (``matched`` false) are dropped whenever another shard matched the filters, so
+    the merge mirrors a single node. Returns ``(filters, results, total, matched,
+    shard_status)``; shards that time out or fail are reported in ``shard_status``.
+    """
+    depth = None if limit is None else offset + limit
+    payload = {"query": query, "limit": depth, "offset": 0}
+    futures = {url: _EXECUTOR.submit(_query_shard, url, payload, timeout) for url in shard_urls}
+    wait(futures.values(), timeout=timeout)
+
+    filters: Dict[str, str] = {}
+    bodies: List[dict] = []
+    status: Dict[str, str] = {}
+    for url, future in futures.items():
+        if not future.done():
+            future.cancel()
+            status[url] = STATUS_TIMEOUT
+            continue
+        try:
+            body = future.result()
+        except requests.Timeout:
+            status[url] = STATUS_TIMEOUT
+            continue
+        except Exception:  # noqa: BLE001
+            status[url] = STATUS_ERROR
+            continue
+        status[url] = STATUS_OK
+        filters = filters or body.get("filters", {})
+        bodies.append(body)
+
+    matched = any(body.get("matched", True) for body in bodies)
+    merged: List[dict] = []
+    total = 0
+    for body in bodies:
+        if matched and not body.get("matched", True):
+            continue
+        merged.extend(body.get("results", []))
+        total += body.get("total", len(body.get("results", [])))
+
+    merged.sort(key=_rank_key)
+    end = None if limit is None else offset + limit
+    return filters, merged[offset:end], total, matched, status
@@ -0,0 +1,144 @@
+"""Columnar catalog snapshots for bootstrapping API replicas without re-ingestion.
+
+A snapshot is a directory holding:
+
+* ``manifest.json``  – format version, model signature, taxonomy hash, row count, dimension.
+* ``columns.npz``    – image ids plus each text column as one UTF-8 byte buffer
+  (``<col>_data``), ``int64`` row offsets (``<col>_offsets``) and a null mask (``<col>_null``).
+* ``embeddings.npy`` – one contiguous ``(rows, dim)`` float32 matrix.
+* ``scores.npy``     – ``(rows, labels)`` uint8 attribute probabilities (``scoring`` layout).
+
+Replicas refuse snapshots produced by a different encoder or taxonomy, since the
+embeddings or attribute layout would not match their own. Downloaded image files are
+not included; ``file_path`` values are kept as exported.
+"""
+from __future__ import annotations
+
+import json
+import time
+from pathlib import Path
+from typing import Dict, List, Optional, Sequence
+
+import numpy as np
+
+from .. import db
+from . import scoring
+from .model_loader import CLIP_MODEL_NAME, model_signature
+from .taxonomy import taxonomy_hash
+
+FORMAT_VERSION = 2
+MANIFEST_FILENAME = "manifest.json"
+COLUMNS_FILENAME = "columns.npz"
+EMBEDDINGS_FILENAME = "embeddings.npy"
+SCORES_FILENAME = "scores.npy"
+TEXT_COLUMNS = ("filename", "file_path", *db.ATTRIBUTE_COLUMNS, "metadata_json")
+
+
+class SnapshotMismatchError(ValueError):
+    """Raised when a snapshot was produced by a different model or taxonomy."""
+
+
+def encode_text_column(values: Sequence[Optional[str]]) -> Dict[str, np.ndarray]:
+    """Pack strings into one UTF-8 buffer with offsets and a null mask."""
+    encoded = [b"" if value is None else value.encode("utf-8") for value in values]
+    offsets = np.zeros(len(encoded) + 1, dtype=np.int64)
+    np.cumsum([len(item) for item in encoded], out=offsets[1:])
+    return {
+        "data": np.frombuffer(b"".join(encoded), dtype=np.uint8),
+        "offsets": offsets,
+        "null": np.array([value is None for value in values], dtype=bool),
+    }
+
+
+def decode_text_column(data: np.ndarray, offsets: np.ndarray, null: np.ndarray) -> List[Optional[str]]:
+    """Inverse of ``encode_text_column``."""
+    buffer = data.tobytes()
+    bounds = offsets.tolist()
+    return [
+        None if is_null else buffer[bounds[i] : bounds[i + 1]].decode("utf-8")
+        for i, is_null in enumerate(null.tolist())
+    ]
+
+
+def export_snapshot(output_dir: Path) -> Dict[str, object]:
+    """Write the current catalog to ``output_dir`` and return its manifest."""
+    rows = db.fetch_catalog()
+    generation = db.get_index_generation()
+    output_dir.mkdir(parents=True, exist_ok=True)
+
+    vectors = np.frombuffer(b"".join(row["vector"] for row in rows), dtype=np.float32)
+    embeddings = vectors.reshape(len(rows), -1) if rows else np.zeros((0, 0), dtype=np.float32)
+    np.save(output_dir / EMBEDDINGS_FILENAME, np.ascontiguousarray(embeddings))
+    np.save(output_dir / SCORES_FILENAME, scoring.quantized_matrix(rows, db.ATTRIBUTE_COLUMNS))
+
+    columns = {"id": np.array([row["id"] for row in rows], dtype=np.int64)}
+    for column in TEXT_COLUMNS:
+        for part, array in encode_text_column([row[column] for row in rows]).items():
+            columns[f"{column}_{part}"] = array
+    np.savez(output_dir / COLUMNS_FILENAME, **columns)
+
+    manifest = {
+        "format_version": FORMAT_VERSION,
+        "model": CLIP_MODEL_NAME,
+        "model_signature": model_signature(),
+        "taxonomy_hash": taxonomy_hash(),
+        "count": len(rows),
+        "dim": int(embeddings.shape[1]),
+        "labels": scoring.LABEL_COUNT,
+        "vector_index": None,
+        "index_generation": generation,
+        "created_at": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime()),
+    }
+    (output_dir / MANIFEST_FILENAME).write_text(json.dumps(manifest, indent=2), encoding="utf-8")
+    return manifest
+
+
+def read_manifest(snapshot_dir: Path) -> Dict[str, object]:
+    """Load a snapshot manifest and verify it matches this replica's model and taxonomy."""
+    manifest = json.loads((snapshot_dir / MANIFEST_FILENAME).read_text(encoding="utf-8"))
+    if manifest.get("format_version") != FORMAT_VERSION:
+        raise SnapshotMismatchError(f"Unsupported snapshot format {manifest.get('format_version')!r}")
+    if manifest.get("model_signature") != model_signature():
+        raise SnapshotMismatchError(
+            f"Snapshot model {manifest.get('model_signature')!r} does not match {model_signature()!r}"
+        )
+    if manifest.get("taxonomy_hash") != taxonomy_hash():
+        raise SnapshotMismatchError("Snapshot taxonomy does not match taxonomy.json")
+    return manifest
+
+
+def import_snapshot(snapshot_dir: Path, replace: bool = False) -> Dict[str, object]:
+    """Bulk-load a verified snapshot into the configured database and return its manifest."""
+    manifest = read_manifest(snapshot_dir)
+    embeddings = np.load(snapshot_dir / EMBEDDINGS_FILENAME, mmap_mode="r")
+    scores = np.load(snapshot_dir / SCORES_FILENAME, mmap_mode="r")
+    with np.load(snapshot_dir / COLUMNS_FILENAME) as data:
+        ids = data["id"].tolist()
+        text = [
+            decode_text_column(data[f"{column}_data"], data[f"{column}_offsets"], data[f"{column}_null"])
+            for column in TEXT_COLUMNS
+        ]
+
+    count = manifest["count"]
+    if not (len(ids) == len(embeddings) == len(scores) == count and all(len(values) == count for values in text)):
+        raise ValueError("Snapshot files disagree on the number of rows")
+    if count and (embeddings.ndim != 2 or embeddings.shape[1] != manifest["dim"]):
+        raise ValueError(f"Snapshot embeddings have shape {embeddings.shape}, expected dim {manifest['dim']}")
+    if scores.ndim != 2 or scores.shape[1] != scoring.LABEL_COUNT:
+        raise ValueError(f"Snapshot scores have shape {scores.shape}, expected {scoring.LABEL_COUNT} labels")
+    db.load_catalog(
+        images=(
+            (image_id, *(values[i] for values in text))
+            for i, image_id in enumerate(ids)
+        ),
+        embeddings=(
+            (image_id, np.asarray(embeddings[i], dtype=np.float32).tobytes())
+            for i, image_id in enumerate(ids)
+        ),
+        scores=(
+            (image_id, scoring.SCORE_LAYOUT, np.asarray(scores[i], dtype=np.uint8).tobytes())
+            for i, image_id in enumerate(ids)
+        ),
+        replace=replace,
+    )
+    return manifest
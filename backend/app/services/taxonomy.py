@@ -0,0 +1,30 @@
+"""Fashion attribute taxonomy and the zero-shot prompts derived from it."""
+from __future__ import annotations
+
+import hashlib
+import json
+from pathlib import Path
+from typing import Dict, List
+
+TAXONOMY_PATH = Path(__file__).resolve().parents[2] / "taxonomy.json"
+DEFAULT_PROMPT_TEMPLATE = "a {label} dress"
+
+
+def load_taxonomy() -> Dict[str, list]:
+    """Load fashion attribute taxonomy from taxonomy.json."""
+    with open(TAXONOMY_PATH, "r") as f:
+        return json.load(f)
+
+
+TAXONOMY = load_taxonomy()
+
+
+def taxonomy_hash(taxonomy: Dict[str, list] | None = None) -> str:
+    """Return a stable content hash of the taxonomy (category and label order included)."""
+    payload = json.dumps(TAXONOMY if taxonomy is None else taxonomy, sort_keys=False, separators=(",", ":"))
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+def build_prompts(labels: List[str], template: str = DEFAULT_PROMPT_TEMPLATE) -> List[str]:
+    """Return one zero-shot prompt per label."""
+    return [template.format(label=label) for label in labels]
@@ -0,0 +1,83 @@
+"""Per-tower PyTorch encoders for role-specific model loading.
+
+Each encoder loads only one half of the sentence-transformers CLIP checkpoint, so a
+search replica never materializes the vision tower and an ingest worker never keeps
+the text tower. Outputs are meant to match ``SentenceTransformer.encode`` for the
+full model; ``parity_report`` (``export_onnx.py --backend torch-split``) measures it.
+"""
+from __future__ import annotations
+
+from pathlib import Path
+from typing import Dict, List, Sequence
+
+import numpy as np
+from PIL import Image
+
+CLIP_HUB_ID = "sentence-transformers/clip-ViT-B-32"
+CLIP_SUBFOLDER = "0_CLIPModel"
+
+
+def clip_checkpoint_path() -> Path:
+    """Return the local Hugging Face checkpoint wrapped by the sentence-transformers model."""
+    from huggingface_hub import snapshot_download
+
+    return Path(snapshot_download(CLIP_HUB_ID)) / CLIP_SUBFOLDER
+
+
+def _batched(items: Sequence, batch_size: int):
+    for start in range(0, len(items), batch_size):
+        yield items[start : start + batch_size]
+
+
+class TorchTextEncoder:
+    """CLIP text tower and tokenizer without the vision weights."""
+
+    def __init__(self, checkpoint: Path) -> None:
+        from transformers import AutoTokenizer, CLIPTextModelWithProjection
+
+        self.tokenizer = AutoTokenizer.from_pretrained(checkpoint)
+        self.model = CLIPTextModelWithProjection.from_pretrained(checkpoint).eval()
+
+    def encode(self, sentences, batch_size: int = 32, convert_to_numpy: bool = True) -> np.ndarray:
+        import torch
+
+        single = isinstance(sentences, str)
+        texts: List[str] = [sentences] if single else list(sentences)
+        outputs = []
+        with torch.inference_mode():
+            for batch in _batched(texts, batch_size):
+                tokens = self.tokenizer(batch, padding=True, return_tensors="pt")
+                outputs.append(self.model(**tokens).text_embeds.float().numpy())
+        result = np.concatenate(outputs)
+        return result[0] if single else result
+
+
+class TorchImageEncoder:
+    """CLIP vision tower and image processor without the text weights."""
+
+    def __init__(self, checkpoint: Path) -> None:
+        from transformers import CLIPImageProcessor, CLIPVisionModelWithProjection
+
+        self.image_processor = CLIPImageProcessor.from_pretrained(checkpoint)
+        self.model = CLIPVisionModelWithProjection.from_pretrained(checkpoint).eval()
+
+    def encode(self, images, batch_size: int = 32, convert_to_numpy: bool = True) -> np.ndarray:
+        import torch
+
+        single = isinstance(images, Image.Image)
+        items: List[Image.Image] = [images] if single else list(images)
+        outputs = []
+        with torch.inference_mode():
+            for batch in _batched(items, batch_size):
+                pixels = self.image_processor(images=batch, return_tensors="pt")["pixel_values"]
+                outputs.append(self.model(pixel_values=pixels).image_embeds.float().numpy())
+        result = np.concatenate(outputs)
+        return result[0] if single else result
+
+
+def parity_report(texts: Sequence[str], images: Sequence[Image.Image]) -> Dict[str, Dict[str, float]]:
+    """Compare the split towers against the full sentence-transformers model."""
+    from .onnx_backend import encoder_parity
+
+    checkpoint = clip_checkpoint_path()
+    return encoder_parity(texts, images, TorchTextEncoder(checkpoint), TorchImageEncoder(checkpoint))
@@ -0,0 +1,85 @@
+"""Export the CLIP towers to ONNX (int8) and report embedding drift against the torch backend.
+
+``--backend torch-split`` skips the export and instead checks the per-tower torch
+encoders used by the ``query`` and ``ingest`` roles against the full model.
+"""
+from __future__ import annotations
+
+import argparse
+from pathlib import Path
+from typing import List
+
+from app.services.ingestion import IMAGES_DIR
+from app.services.model_loader import onnx_model_dir
+from app.services import torch_backend
+from app.services.onnx_backend import export_onnx, parity_report
+from app.services.processor import load_image
+from app.services.taxonomy import TAXONOMY, build_prompts
+
+IMAGE_SUFFIXES = {".jpg", ".jpeg", ".png", ".webp"}
+BACKEND_ONNX = "onnx"
+BACKEND_TORCH_SPLIT = "torch-split"
+
+
+def sample_texts() -> List[str]:
+    """Return taxonomy prompts plus a few free-text queries as a text parity set."""
+    prompts = [prompt for labels in TAXONOMY.values() for prompt in build_prompts(labels)]
+    return prompts + ["navy long sleeve A-line", "red floor-length ball gown", "sleeveless mermaid"]
+
+
+def sample_images(limit: int) -> list:
+    """Return up to ``limit`` downloaded catalog images as an image parity set."""
+    if not IMAGES_DIR.exists():
+        return []
+    paths = sorted(p for p in IMAGES_DIR.iterdir() if p.suffix.lower() in IMAGE_SUFFIXES)
+    return [load_image(path) for path in paths[:limit]]
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Export CLIP towers to ONNX and check parity")
+    parser.add_argument(
+        "--backend",
+        choices=(BACKEND_ONNX, BACKEND_TORCH_SPLIT),
+        default=BACKEND_ONNX,
+        help="Encoders to check against the full sentence-transformers model",
+    )
+    parser.add_argument("--output", type=Path, default=None, help="Target directory (defaults to settings.onnx_dir)")
+    parser.add_argument("--no-quantize", action="store_true", help="Skip dynamic int8 quantization")
+    parser.add_argument("--skip-export", action="store_true", help="Only run the parity check on existing exports")
+    parser.add_argument("--samples", type=int, default=32, help="Number of catalog images used for the parity check")
+    parser.add_argument(
+        "--threshold",
+        type=float,
+        default=0.99,
+        help="Minimum image cosine to keep embeddings stored by the torch backend",
+    )
+    args = parser.parse_args()
+
+    output_dir = args.output or onnx_model_dir()
+    quantized = not args.no_quantize
+
+    if args.backend == BACKEND_TORCH_SPLIT:
+        report = torch_backend.parity_report(sample_texts(), sample_images(args.samples))
+    else:
+        if not args.skip_export:
+            for path in export_onnx(output_dir, quantize=quantized):
+                print(f"Wrote {path}")
+        report = parity_report(sample_texts(), sample_images(args.samples), output_dir, quantized=quantized)
+
+    for tower, stats in report.items():
+        print(
+            f"{tower}: n={stats['count']} mean_cos={stats['mean_cosine']:.5f} "
+            f"min_cos={stats['min_cosine']:.5f} max_drift={stats['max_drift']:.5f}"
+        )
+
+    image_stats = report.get("image")
+    if image_stats is None:
+        print("No catalog images found; image drift was not measured")
+    elif image_stats["min_cosine"] < args.threshold:
+        print("Image drift exceeds threshold: re-encode stored embeddings before switching backends")
+    else:
+        print("Image drift within threshold: stored embeddings can be kept")
+
+
+if __name__ == "__main__":
+    main()
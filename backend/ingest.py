@@ -3,12 +3,17 @@ from __future__ import annotations
 
 import argparse
 import csv
+import os
 from pathlib import Path
 from typing import Iterable
 
-from app import db
-from app.services.ingestion import ingest_url
-from app.services.model_loader import get_models
+# Ingestion only needs the vision tower plus the precomputed taxonomy prompt table.
+# Set as a default before settings load so an explicit DRESS_SEARCH_MODEL_ROLE still wins.
+os.environ.setdefault("DRESS_SEARCH_MODEL_ROLE", "ingest")
+
+from app import db  # noqa: E402
+from app.services.ingestion import ingest_url  # noqa: E402
+from app.services.model_loader import get_models  # noqa: E402
 
 
 def load_urls(csv_path: Path) -> Iterable[str]:
@@ -0,0 +1,27 @@
+"""Re-tag stored images from their embeddings after taxonomy.json changes."""
+from __future__ import annotations
+
+import argparse
+
+from app import db
+from app.services.reclassify import DEFAULT_CHUNK_SIZE, reclassify_catalog
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Recompute attributes from stored embeddings")
+    parser.add_argument("--chunk-size", type=int, default=DEFAULT_CHUNK_SIZE, help="Embeddings per transaction")
+    parser.add_argument("--restart", action="store_true", help="Ignore the saved checkpoint and start over")
+    args = parser.parse_args()
+
+    db.initialize_schema()
+    total = reclassify_catalog(
+        chunk_size=args.chunk_size,
+        restart=args.restart,
+        progress=lambda done, last_id: print(f"Updated {done} images (last id {last_id})"),
+    )
+    print(f"Re-classified {total} images")
+    print("Restart running API workers so they load the updated taxonomy")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,80 @@
+"""Split the catalog into shard databases and serve them locally behind a coordinator."""
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+from app import db
+from app.services.sharding import SHARD_KEYS, shard_db_path, split_database
+
+
+def split(args: argparse.Namespace) -> None:
+    source = args.source or db.get_db_path()
+    paths = split_database(source, args.output, args.shards, key=args.by)
+    for path in paths:
+        print(f"Wrote {path}")
+
+
+def serve(args: argparse.Namespace) -> None:
+    """Start one uvicorn process per shard plus a coordinator, all on this machine."""
+    processes = []
+    urls = []
+    for index in range(args.shards):
+        port = args.base_port + index
+        env = dict(
+            os.environ,
+            DRESS_SEARCH_DB_PATH=str(shard_db_path(args.output.resolve(), index)),
+            DRESS_SEARCH_MODEL_ROLE="query",
+        )
+        processes.append(_uvicorn(args.host, port, env))
+        urls.append(f"http://{args.host}:{port}")
+
+    coordinator_env = dict(os.environ, DRESS_SEARCH_SHARD_URLS=json.dumps(urls))
+    processes.append(_uvicorn(args.host, args.coordinator_port, coordinator_env))
+    print(f"Coordinator: http://{args.host}:{args.coordinator_port}/coordinator/search")
+    print(f"Shards: {', '.join(urls)}")
+
+    try:
+        for process in processes:
+            process.wait()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        for process in processes:
+            process.terminate()
+
+
+def _uvicorn(host: str, port: int, env: dict) -> subprocess.Popen:
+    command = [sys.executable, "-m", "uvicorn", "app.main:app", "--host", host, "--port", str(port)]
+    return subprocess.Popen(command, env=env, cwd=Path(__file__).resolve().parent)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Shard the dress catalog")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    split_parser = subparsers.add_parser("split", help="Partition the database into shard files")
+    split_parser.add_argument("--source", type=Path, default=None, help="Source database (defaults to settings.db_path)")
+    split_parser.add_argument("--output", type=Path, default=Path("shards"), help="Directory for shard_N.db files")
+    split_parser.add_argument("--shards", type=int, required=True, help="Number of shards")
+    split_parser.add_argument("--by", choices=SHARD_KEYS, default="id", help="Partition key (id hash or an attribute)")
+    split_parser.set_defaults(handler=split)
+
+    serve_parser = subparsers.add_parser("serve", help="Run shard APIs and a coordinator locally")
+    serve_parser.add_argument("--output", type=Path, default=Path("shards"), help="Directory holding shard_N.db files")
+    serve_parser.add_argument("--shards", type=int, required=True, help="Number of shards")
+    serve_parser.add_argument("--host", default="127.0.0.1")
+    serve_parser.add_argument("--base-port", type=int, default=8001, help="Port of shard 0; shard N uses base + N")
+    serve_parser.add_argument("--coordinator-port", type=int, default=8000)
+    serve_parser.set_defaults(handler=serve)
+
+    args = parser.parse_args()
+    args.handler(args)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,38 @@
+"""Export the catalog to a portable snapshot, or bootstrap a replica from one."""
+from __future__ import annotations
+
+import argparse
+from pathlib import Path
+
+from app import db
+from app.services.snapshot import export_snapshot, import_snapshot
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Export or import a catalog snapshot")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    export_parser = subparsers.add_parser("export", help="Write the catalog to a snapshot directory")
+    export_parser.add_argument("output", type=Path, help="Target snapshot directory")
+
+    import_parser = subparsers.add_parser("import", help="Load a snapshot into the local database")
+    import_parser.add_argument("snapshot", type=Path, help="Snapshot directory written by export")
+    import_parser.add_argument("--replace", action="store_true", help="Overwrite an existing catalog")
+
+    args = parser.parse_args()
+    db.initialize_schema()
+
+    if args.command == "export":
+        manifest = export_snapshot(args.output)
+        print(f"Exported {manifest['count']} images to {args.output}")
+        return
+
+    try:
+        manifest = import_snapshot(args.snapshot, replace=args.replace)
+    except ValueError as exc:  # includes SnapshotMismatchError
+        raise SystemExit(f"Refusing snapshot: {exc}") from exc
+    print(f"Imported {manifest['count']} images from {args.snapshot}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,26 @@
+"""Shared fixtures for the model-free backend tests (run ``pytest tests`` from ``backend/``)."""
+from __future__ import annotations
+
+import sys
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from app.config import get_settings  # noqa: E402
+from app.services import catalog, response_cache  # noqa: E402
+
+
+@pytest.fixture
+def settings(tmp_path, monkeypatch):
+    """Point the database and caches at ``tmp_path`` and reset per-process state."""
+    settings = get_settings()
+    monkeypatch.setattr(settings, "db_path", str(tmp_path / "dress_search.db"))
+    monkeypatch.setattr(settings, "cache_dir", str(tmp_path / "cache"))
+    monkeypatch.setattr(settings, "response_cache_backend", response_cache.BACKEND_MEMORY)
+    monkeypatch.setattr(settings, "response_cache_path", str(tmp_path / "cache" / "response_cache.db"))
+    monkeypatch.setattr(catalog, "_current", None)
+    response_cache.get_response_cache.cache_clear()
+    yield settings
+    response_cache.get_response_cache.cache_clear()
@@ -0,0 +1,154 @@
+"""Response cache eviction and generation checks, plus cached vs. fresh ``/search`` parity."""
+from __future__ import annotations
+
+import itertools
+import json
+
+import numpy as np
+import pytest
+from fastapi.testclient import TestClient
+
+from app import db, main
+from app.services import catalog, processor, response_cache, scoring
+
+
+def test_memory_cache_evicts_least_recently_used_beyond_byte_budget():
+    cache = response_cache.MemoryCache(max_bytes=10)
+    cache.put("a", 1, b"aaaa")
+    cache.put("b", 1, b"bbbb")
+    assert cache.get("a", 1) == b"aaaa"
+
+    cache.put("c", 1, b"cccc")
+    assert cache.get("b", 1) is None
+    assert cache.get("a", 1) == b"aaaa"
+    assert cache.get("c", 1) == b"cccc"
+
+    cache.put("huge", 1, b"x" * 11)
+    assert cache.get("huge", 1) is None
+    assert cache.get("a", 1) == b"aaaa"
+
+
+def test_memory_cache_drops_entries_from_another_generation():
+    cache = response_cache.MemoryCache(max_bytes=100)
+    cache.put("a", 1, b"old")
+    assert cache.get("a", 2) is None
+    assert cache.get("a", 1) is None
+
+    cache.put("a", 2, b"new")
+    assert cache.get("a", 2) == b"new"
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    """Make ``time.time`` in the cache module advance one second per call."""
+    ticks = itertools.count(1_000_000)
+    monkeypatch.setattr(response_cache.time, "time", lambda: float(next(ticks)))
+
+
+def _stored_keys(cache):
+    with cache._connect() as conn:
+        return {row[0] for row in conn.execute("SELECT key FROM response_cache")}
+
+
+def test_sqlite_cache_skips_and_deletes_entries_from_another_generation(tmp_path):
+    cache = response_cache.SqliteCache(tmp_path / "cache.db", max_bytes=100)
+    cache.put("a", 1, b"old")
+    assert cache.get("a", 2) is None
+    assert _stored_keys(cache) == set()
+
+    cache.put("a", 2, b"new")
+    assert cache.get("a", 2) == b"new"
+
+
+def test_sqlite_cache_evicts_least_recently_used_beyond_byte_budget(tmp_path, clock, monkeypatch):
+    monkeypatch.setattr(response_cache, "ACCESS_RESOLUTION", 0.0)
+    cache = response_cache.SqliteCache(tmp_path / "cache.db", max_bytes=10)
+    cache.put("a", 1, b"aaaa")
+    cache.put("b", 1, b"bbbb")
+    assert cache.get("a", 1) == b"aaaa"
+
+    cache.put("c", 1, b"cccc")
+    assert _stored_keys(cache) == {"a", "c"}
+
+    cache.put("huge", 1, b"x" * 11)
+    assert _stored_keys(cache) == {"a", "c"}
+
+
+def test_sqlite_cache_is_shared_between_instances(tmp_path):
+    path = tmp_path / "cache.db"
+    response_cache.SqliteCache(path, max_bytes=100).put("a", 1, b"payload")
+    assert response_cache.SqliteCache(path, max_bytes=100).get("a", 1) == b"payload"
+
+
+@pytest.fixture
+def client(settings, monkeypatch):
+    """A ``/search`` client over a small catalog, with query parsing and encoding stubbed."""
+    parsed = []
+
+    def parse_query_filters(query):
+        parsed.append(query)
+        return {
+            category: label
+            for category, labels in processor.TAXONOMY.items()
+            for label in labels
+            if label.lower() in query
+        }
+
+    def encode_text(query):
+        seed = int.from_bytes(query.encode("utf-8")[:8].ljust(8, b"\0"), "little")
+        return np.random.default_rng(seed).standard_normal(8).astype(np.float32)
+
+    monkeypatch.setattr(processor, "parse_query_filters", parse_query_filters)
+    monkeypatch.setattr(processor, "encode_text", encode_text)
+
+    rng = np.random.default_rng(0)
+    db.initialize_schema()
+    for i, color in enumerate(["red", "blue", "red", "navy", "red", "black"]):
+        probabilities = np.full(scoring.LABEL_COUNT, 0.1)
+        probabilities[scoring.LABEL_INDEX[("color", color)]] = 0.9
+        db.insert_image(
+            db.ImageRecord(f"{i}.jpg", f"images/{i}.jpg", "A-line", "mini", "sleeveless", color, "{}"),
+            rng.standard_normal(8).astype(np.float32).tobytes(),
+            scores=scoring.quantize(probabilities),
+            score_layout=scoring.SCORE_LAYOUT,
+        )
+    test_client = TestClient(main.app)
+    test_client.parsed = parsed
+    return test_client
+
+
+@pytest.mark.parametrize("backend", [response_cache.BACKEND_MEMORY, response_cache.BACKEND_SQLITE])
+def test_cached_search_matches_fresh_search(client, settings, monkeypatch, backend):
+    monkeypatch.setattr(settings, "response_cache_backend", backend)
+    response_cache.get_response_cache.cache_clear()
+
+    fresh = client.post("/search", json={"query": "  Red   Dress ", "limit": 2})
+    cached = client.post("/search", json={"query": "red dress", "limit": 2})
+    assert fresh.status_code == cached.status_code == 200
+    assert client.parsed == ["red dress"]
+    assert cached.content == fresh.content
+    body = json.loads(fresh.content)
+    assert body["filters"] == {"color": "red"}
+    assert [item["color"] for item in body["results"]] == ["red", "red"]
+    assert body["total"] == 3
+
+    monkeypatch.setattr(settings, "response_cache_backend", response_cache.BACKEND_NONE)
+    response_cache.get_response_cache.cache_clear()
+    uncached = client.post("/search", json={"query": "red dress", "limit": 2})
+    assert uncached.content == fresh.content
+    assert len(client.parsed) == 2
+
+
+def test_catalog_write_invalidates_cached_search(client):
+    first = client.post("/search", json={"query": "red dress"}).json()
+    db.insert_image(
+        db.ImageRecord("new.jpg", "images/new.jpg", "A-line", "mini", "sleeveless", "red", "{}"),
+        np.ones(8, dtype=np.float32).tobytes(),
+    )
+    # The bump starts a background rebuild; wait for it before searching again.
+    catalog.get_catalog()
+    with catalog._lock:
+        pass
+    second = client.post("/search", json={"query": "red dress"}).json()
+    assert second["total"] == first["total"] + 1
+    assert len(client.parsed) == 2
@@ -0,0 +1,193 @@
+"""Scatter-gather merging and database splitting, with shard HTTP calls stubbed out."""
+from __future__ import annotations
+
+import time
+
+import numpy as np
+import pytest
+import requests
+
+from app import db
+from app.services import scoring, sharding
+
+COLORS = ("red", "blue", "navy", "black")
+
+
+def _stub_shards(monkeypatch, replies):
+    """Serve each shard URL from ``replies``: a response body, an exception or a callable."""
+    calls = []
+
+    def query_shard(url, payload, timeout):
+        calls.append((url, payload))
+        reply = replies[url]
+        if isinstance(reply, Exception):
+            raise reply
+        return reply() if callable(reply) else reply
+
+    monkeypatch.setattr(sharding, "_query_shard", query_shard)
+    return calls
+
+
+def _body(results, matched=True, total=None, filters=None):
+    return {
+        "filters": filters or {"color": "red"},
+        "results": [{"id": image_id, "score": score} for image_id, score in results],
+        "total": len(results) if total is None else total,
+        "matched": matched,
+    }
+
+
+def test_fallback_shards_are_dropped_when_another_shard_matched(monkeypatch):
+    _stub_shards(
+        monkeypatch,
+        {
+            "a": _body([(1, 0.9), (4, 0.2)], total=2),
+            "b": _body([(2, 0.95), (3, 0.5)], matched=False, total=7),
+        },
+    )
+    filters, results, total, matched, status = sharding.scatter_search(["a", "b"], "red", 10, 0, 2.0)
+    assert filters == {"color": "red"}
+    assert [item["id"] for item in results] == [1, 4]
+    assert total == 2
+    assert matched is True
+    assert status == {"a": sharding.STATUS_OK, "b": sharding.STATUS_OK}
+
+
+def test_all_fallback_shards_are_merged(monkeypatch):
+    _stub_shards(
+        monkeypatch,
+        {
+            "a": _body([(1, 0.9)], matched=False, total=3),
+            "b": _body([(2, 0.95), (3, 0.5)], matched=False, total=7),
+        },
+    )
+    _, results, total, matched, _ = sharding.scatter_search(["a", "b"], "red", 10, 0, 2.0)
+    assert [item["id"] for item in results] == [2, 1, 3]
+    assert total == 10
+    assert matched is False
+
+
+def test_each_shard_is_asked_for_offset_plus_limit_and_the_page_is_cut_after_merging(monkeypatch):
+    calls = _stub_shards(
+        monkeypatch,
+        {
+            "a": _body([(1, 0.9), (3, 0.7), (5, 0.5), (7, 0.0)]),
+            "b": _body([(2, 0.8), (4, 0.7), (6, 0.4), (8, 0.0)]),
+        },
+    )
+    _, results, total, _, _ = sharding.scatter_search(["a", "b"], "red", 3, 2, 2.0)
+    assert {payload["limit"] for _, payload in calls} == {5}
+    assert {payload["offset"] for _, payload in calls} == {0}
+    # Global order: 1, 2, 3, 4 (tie broken by id), 5, 6, 7, 8 (zero scores are not missing).
+    assert [item["id"] for item in results] == [3, 4, 5]
+    assert total == 8
+
+    _, results, _, _, _ = sharding.scatter_search(["a", "b"], "red", None, 5, 2.0)
+    assert calls[-1][1]["limit"] is None
+    assert [item["id"] for item in results] == [6, 7, 8]
+
+
+def test_zero_score_is_ranked_by_score_not_similarity(monkeypatch):
+    _stub_shards(
+        monkeypatch,
+        {
+            "a": {"results": [{"id": 1, "score": 0.0, "similarity": 0.99}], "total": 1},
+            "b": {"results": [{"id": 2, "score": 0.1, "similarity": 0.05}], "total": 1},
+        },
+    )
+    _, results, _, _, _ = sharding.scatter_search(["a", "b"], "dress", 10, 0, 2.0)
+    assert [item["id"] for item in results] == [2, 1]
+
+
+def test_timeouts_and_errors_are_reported_per_shard(monkeypatch):
+    def slow():
+        time.sleep(0.5)
+        return _body([(9, 1.0)])
+
+    _stub_shards(
+        monkeypatch,
+        {
+            "ok": _body([(1, 0.9)]),
+            "slow": slow,
+            "timeout": requests.Timeout("read timed out"),
+            "broken": requests.HTTPError("500 Server Error"),
+        },
+    )
+    _, results, total, _, status = sharding.scatter_search(["ok", "slow", "timeout", "broken"], "red", 10, 0, 0.1)
+    assert status == {
+        "ok": sharding.STATUS_OK,
+        "slow": sharding.STATUS_TIMEOUT,
+        "timeout": sharding.STATUS_TIMEOUT,
+        "broken": sharding.STATUS_ERROR,
+    }
+    assert [item["id"] for item in results] == [1]
+    assert total == 1
+
+
+@pytest.fixture
+def source_db(tmp_path):
+    path = tmp_path / "source.db"
+    with db.connect(path) as conn:
+        db.apply_schema(conn)
+        for image_id in range(1, 25):
+            conn.execute(
+                "INSERT INTO images VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                (image_id, f"{image_id}.jpg", f"images/{image_id}.jpg", "A-line", "mini", "sleeveless",
+                 COLORS[image_id % len(COLORS)], "{}"),
+            )
+            conn.execute(
+                "INSERT INTO embeddings VALUES (?, ?)",
+                (image_id, np.full(4, image_id, dtype=np.float32).tobytes()),
+            )
+            if image_id % 2:
+                conn.execute(
+                    "INSERT INTO attribute_scores VALUES (?, ?, ?)",
+                    (image_id, scoring.SCORE_LAYOUT, bytes(scoring.LABEL_COUNT)),
+                )
+        conn.commit()
+    return path
+
+
+def _shard_contents(path):
+    with db.connect(path) as conn:
+        images = {row["id"]: row["color"] for row in conn.execute("SELECT id, color FROM images")}
+        embeddings = {row[0]: row[1] for row in conn.execute("SELECT image_id, vector FROM embeddings")}
+        scores = {row[0] for row in conn.execute("SELECT image_id FROM attribute_scores")}
+    return images, embeddings, scores
+
+
+@pytest.mark.parametrize("key", ["id", "color"])
+def test_split_partitions_every_table(tmp_path, source_db, key):
+    paths = sharding.split_database(source_db, tmp_path / "shards", 3, key=key)
+    assert [path.name for path in paths] == ["shard_0.db", "shard_1.db", "shard_2.db"]
+
+    seen = {}
+    for index, path in enumerate(paths):
+        images, embeddings, scores = _shard_contents(path)
+        assert set(embeddings) == set(images)
+        assert scores == {image_id for image_id in images if image_id % 2}
+        for image_id, vector in embeddings.items():
+            assert np.frombuffer(vector, dtype=np.float32)[0] == image_id
+        for image_id, color in images.items():
+            value = image_id if key == "id" else color
+            assert sharding.shard_for(value, 3) == index
+            seen[image_id] = color
+    assert sorted(seen) == list(range(1, 25))
+
+    if key == "color":
+        for color in COLORS:
+            assert sum(color in _shard_contents(path)[0].values() for path in paths) == 1
+
+
+def test_split_refuses_to_overwrite_existing_shards(tmp_path, source_db):
+    output = tmp_path / "shards"
+    output.mkdir()
+    (output / "shard_2.db").write_bytes(b"")
+    with pytest.raises(FileExistsError):
+        sharding.split_database(source_db, output, 3)
+    assert sorted(path.name for path in output.iterdir()) == ["shard_2.db"]
+
+
+def test_split_rejects_unknown_key(tmp_path, source_db):
+    with pytest.raises(ValueError):
+        sharding.split_database(source_db, tmp_path / "shards", 2, key="metadata_json")